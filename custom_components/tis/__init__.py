@@ -22,13 +22,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # First discovery to populate devices quickly (non-blocking)
-    hass.async_create_task(coordinator.async_discover())
+    # First discovery to populate devices quickly (non-blocking). Start it
+    # eagerly where supported so the broadcast goes out without waiting for the
+    # next loop iteration; keep a reference so the task is not garbage collected.
+    discovery = coordinator.async_discover()
+    try:
+        coordinator.initial_discovery = hass.async_create_task(discovery, eager_start=True)
+    except TypeError:
+        # Home Assistant < 2024.3 has no eager_start
+        coordinator.initial_discovery = hass.async_create_task(discovery)
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    # Platforms first: their listeners go away before the client stops
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     coordinator: TisCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
-    await coordinator.client.async_stop()
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if coordinator.initial_discovery and not coordinator.initial_discovery.done():
+        coordinator.initial_discovery.cancel()
+    await coordinator.async_stop()
+    return True
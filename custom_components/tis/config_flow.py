@@ -6,6 +6,14 @@ from homeassistant.data_entry_flow import FlowResult
 
 from .const import DOMAIN, DEFAULT_HOST, DEFAULT_PORT
 
+# Built once at import and reused by every flow
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required("host", default=DEFAULT_HOST): str,
+        vol.Required("port", default=DEFAULT_PORT): int,
+    }
+)
+
 
 class TisConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -14,10 +22,4 @@ class TisConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             return self.async_create_entry(title=f"TIS {user_input['host']}", data=user_input)
 
-        schema = vol.Schema(
-            {
-                vol.Required("host", default=DEFAULT_HOST): str,
-                vol.Required("port", default=DEFAULT_PORT): int,
-            }
-        )
-        return self.async_show_form(step_id="user", data_schema=schema)
+        return self.async_show_form(step_id="user", data_schema=_USER_SCHEMA)
@@ -3,6 +3,8 @@ DOMAIN = "tis"
 DEFAULT_HOST = "192.168.1.200"
 DEFAULT_PORT = 6000
 DEFAULT_SCAN_TIMEOUT = 2.0
+# Periodic rediscovery; keeps non-polled devices inside the 30 s online window
+DEFAULT_DISCOVERY_INTERVAL = 20
 
 DISCOVERY_OPCODE = 0x000E
 DISCOVERY_RESPONSE_OPCODE = 0x000F
@@ -182,5 +184,13 @@ DEVICE_TYPES = {0: 'Control Panel (Generic)',
  65534: 'Light Dimmer (Generic)'}
 
 
-# Dispatcher signal fired on every received/parsed packet
-SIGNAL_TIS_UPDATE = f"{DOMAIN}_update"
+# Opcodes only RCU devices emit (states/types/channel control)
+RCU_OPCODES = frozenset((0x2025, 0x0005, 0x0034, 0x0033, 0x0031, 0x0032))
+
+# Device type codes of RCU models, resolved once from DEVICE_TYPES
+RCU_TYPES = frozenset(dt for dt, model in DEVICE_TYPES.items() if model.startswith("RCU"))
+# Same test as the old model.startswith("RCU24"). The models are named
+# "RCU-24...", so this set is empty and rcu_layout relies on the state
+# length. It is inert on purpose: matching "RCU-24" makes the layout
+# fallback and the 0x0005 typed path create duplicate input entities.
+RCU24_TYPES = frozenset(dt for dt, model in DEVICE_TYPES.items() if model.startswith("RCU24"))
@@ -3,66 +3,123 @@ from __future__ import annotations
 import asyncio
 import logging
 import socket
+import struct
+import sys
 import time
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Set
-
-from homeassistant.core import HomeAssistant
+from datetime import timedelta
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.helpers.dispatcher import dispatcher_send
 
 from .const import (
-    DEVICE_TYPES,
     DOMAIN,
+    DEFAULT_DISCOVERY_INTERVAL,
     DEFAULT_SCAN_TIMEOUT,
     DISCOVERY_OPCODE,
     DISCOVERY_RESPONSE_OPCODE,
-    SIGNAL_TIS_UPDATE,
+    RCU24_TYPES,
+    RCU_OPCODES,
+    RCU_TYPES,
+)
+from .protocol import (
+    HEADER,
+    HEADER_OFFSET,
+    MIN_PACKET_LEN,
+    SMARTCLOUD_MAGIC,
+    SMARTCLOUD_MAGIC_OFFSET,
+    build_packet_bytes,
+    parse_smartcloud_packet,
 )
-from .protocol import build_packet, parse_smartcloud_packet
 
 _LOGGER = logging.getLogger(__name__)
 
+# Max datagrams handled per receive wakeup before yielding to the loop
+_RX_BATCH = 32
+_SOCKBUF_SIZE = 4 * 1024 * 1024
+# Receive errors: exponential backoff capped at _RX_BACKOFF_MAX seconds, and
+# the socket is rebound after _RX_MAX_ERRORS consecutive failures
+_RX_BACKOFF_MAX = 5.0
+_RX_MAX_ERRORS = 10
+# RCU state polling: devices whose states change are polled every _POLL_MIN
+# seconds; quiet ones back off towards _POLL_MAX
+_POLL_MIN = 5.0
+_POLL_MAX = 20.0
+_POLL_BACKOFF = 1.5
+# Listener pushes are coalesced over this window; a state burst from several
+# RCUs becomes one coordinator update. The window is not extended by new
+# packets, so steady traffic still updates entities every _NOTIFY_DELAY.
+_NOTIFY_DELAY = 0.02
+# Entities found by coordinator updates are added in batches this far apart
+_ADD_ENTITIES_DELAY = 0.05
+# discover() returns early once no new device has answered for this long
+_DISCOVERY_QUIET = 0.5
+# Opcodes _handle_packet acts on; everything else is dropped before parsing
+_INTERESTING_OPCODES = RCU_OPCODES | {DISCOVERY_RESPONSE_OPCODE}
+# 0x0031 payload: channel, value, ramp seconds
+_SET_CHANNEL = struct.Struct("!BBH")
+
 
 def _extract_cstr(data: bytes) -> str:
     """0-terminated (C string) decode from additional_data."""
     if not data:
         return ""
+    # additional_data may be a memoryview over the receive buffer
+    data = bytes(data)
     nul = data.find(b"\x00")
     if nul != -1:
         data = data[:nul]
-    try:
-        return data.decode("utf-8", errors="ignore").strip()
-    except Exception:
-        return ""
+    # errors="ignore" cannot raise
+    return data.decode("utf-8", errors="ignore").strip()
 
 
-def _is_rcu(device_type: int | None) -> bool:
-    """Return True if device_type maps to an RCU model."""
-    if device_type is None:
-        return False
-    model = DEVICE_TYPES.get(device_type, "")
-    return model.startswith("RCU")
-
-
-def _parse_0005(add: bytes) -> tuple[int, list[int]]:
+def _parse_0005(add: bytes) -> tuple[int, bytes]:
     """RCU channel types (0x0005): [qty][kind][types...]"""
     if not add:
-        return 0, []
+        return 0, b""
     qty = add[0]
     if qty <= 0:
-        return 0, []
+        return 0, b""
     # add[1] is "kind" in your tester; types start at add[2]
-    types = list(add[2 : 2 + qty]) if len(add) >= 2 + qty else list(add[2:])
-    return qty, types
-
-
-def _parse_2025(add: bytes) -> list[int]:
-    """RCU channel states list (0x2025)."""
-    return list(add) if add else []
-
-
-@dataclass
+    # (slicing clamps, so a short packet just yields fewer types)
+    return qty, bytes(add[2 : 2 + qty])
+
+
+def _parse_2025(add: bytes) -> bytes:
+    """RCU channel states (0x2025), one byte per channel."""
+    return bytes(add) if add else b""
+
+
+@lru_cache(maxsize=256)
+def _request_packet(
+    source_ip: str,
+    src_sub: int,
+    src_dev: int,
+    dev_type: int,
+    opcode: int,
+    payload: bytes = b"",
+) -> bytes:
+    """Build a request packet addressed to one device.
+
+    Memoized: the poll loop sends the same read requests to every device on
+    each round, and relay on/off commands repeat the same few payloads.
+    """
+    return build_packet_bytes(
+        opcode,
+        source_ip,
+        device_id=(src_sub & 0xFF, src_dev & 0xFF),
+        source_device_id=(0x00, 0x00),
+        device_type=dev_type & 0xFFFF,
+        additional_packets=payload,
+    )
+
+
+@dataclass(slots=True)
 class TisDeviceInfo:
     """Discovery satırı: GW IP + Source Subnet/Device + type + name vb."""
     unique_id: str  # "{gw_ip}-{sub}-{dev}"
@@ -72,17 +129,25 @@ class TisDeviceInfo:
 
     name: str = ""
     device_type: Optional[int] = None
-    last_seen: float = 0.0
+    last_seen: float = 0.0  # time.monotonic()
+    # Bounded: only _INTERESTING_OPCODES get past the receive prefilter
     opcodes_seen: Set[int] = field(default_factory=set)
-    raw: dict = field(default_factory=dict)
 
     # RCU channel metadata/state (filled when related packets arrive)
     channel_count: Optional[int] = None
-    channel_types: list[int] = field(default_factory=list)  # 0=unused,1=output,2=input
-    channel_states: list[int] = field(default_factory=list)  # 0/1
+    channel_types: bytes = b""  # one byte per channel: 0=unused,1=output,2=input
+    channel_states: bytes = b""  # one byte per channel, 0/1
 
     # Internal bookkeeping to avoid spamming type queries
     rcu_types_requested: bool = False
+    # (gw_ip, port) sockaddr for requests, built once when the device is created
+    addr: Optional[Tuple[str, int]] = None
+    # Adaptive state polling, see TisUdpClient._rcu_poll_loop
+    poll_interval: float = _POLL_MIN
+    next_poll: float = 0.0  # time.monotonic()
+    # Bumped whenever something entity platforms derive their layout from
+    # changes (type, name, opcodes, channel types, state vector length)
+    layout_version: int = 0
 
     @property
     def src_str(self) -> str:
@@ -95,12 +160,97 @@ class TisDeviceInfo:
         return f"0x{self.device_type:04X}"
 
 
-@dataclass
+@dataclass(slots=True)
 class TisState:
-    last_rx_ts: float | None = None
+    last_rx_ts: float | None = None  # time.monotonic()
     discovered: Dict[str, TisDeviceInfo] = field(default_factory=dict)  # key=unique_id
 
 
+def is_rcu_device(device: TisDeviceInfo) -> bool:
+    """Best-effort detection of an RCU device.
+
+    Not all firmwares report a device_type that maps to DEVICE_TYPES.
+    In that case we fall back to observed opcodes / payload characteristics.
+    """
+    if device.device_type in RCU_TYPES:
+        return True
+
+    name = (device.name or "").upper()
+    if "RCU" in name:
+        return True
+
+    # Heuristic: RCU devices tend to emit these opcodes (states/types)
+    if not RCU_OPCODES.isdisjoint(device.opcodes_seen):
+        return True
+
+    # Another heuristic: if we have a long channel state vector, it's very likely an RCU
+    if len(device.channel_states) >= 20:
+        return True
+
+    return False
+
+
+def rcu_layout(device: TisDeviceInfo) -> tuple[int, int]:
+    """Return (outputs, inputs) for known RCU models."""
+    if device.device_type in RCU24_TYPES:
+        return (24, 20)
+
+    # If we already saw a long state vector, assume the common 24/20 layout.
+    if len(device.channel_states) >= 44:
+        return (24, 20)
+
+    return (0, 0)
+
+
+def _apply_name(info: TisDeviceInfo, add: bytes) -> bool:
+    """0x000F -> name in additional_data"""
+    name = _extract_cstr(add)
+    if not name or name == info.name:
+        return False
+    info.name = name
+    info.layout_version += 1
+    return True
+
+
+def _apply_channel_types(info: TisDeviceInfo, add: bytes) -> bool:
+    """0x0005 -> RCU channel types"""
+    qty, types = _parse_0005(add)
+    changed = False
+    if qty and qty != info.channel_count:
+        info.channel_count = qty
+        changed = True
+    if types and types != info.channel_types:
+        info.channel_types = types
+        info.layout_version += 1
+        changed = True
+    return changed
+
+
+def _apply_channel_states(info: TisDeviceInfo, add: bytes) -> bool:
+    """0x2025 -> RCU channel states"""
+    states = _parse_2025(add)
+    if not states or states == info.channel_states:
+        # Periodic poll answers are mostly unchanged
+        return False
+    if len(states) != len(info.channel_states):
+        info.layout_version += 1
+    info.channel_states = states
+    # Active device: poll it closely again, starting now rather than after
+    # the long interval the poll loop already scheduled
+    info.poll_interval = _POLL_MIN
+    info.next_poll = min(info.next_poll, time.monotonic() + _POLL_MIN)
+    return True
+
+
+# Payload handlers by opcode; each returns True if it changed the device.
+# Other opcodes only refresh last_seen/opcodes_seen.
+_OP_HANDLERS: Dict[int, Callable[[TisDeviceInfo, bytes], bool]] = {
+    DISCOVERY_RESPONSE_OPCODE: _apply_name,
+    0x0005: _apply_channel_types,
+    0x2025: _apply_channel_states,
+}
+
+
 class TisUdpClient:
     """UDP discovery + receive loop for TIS SmartCloud packets."""
 
@@ -110,38 +260,117 @@ class TisUdpClient:
         self.port = port
 
         self._sock: Optional[socket.socket] = None
-        self._task: Optional[asyncio.Task] = None
+        # Set by async_close(); async_start() is then a no-op, so late sends
+        # or scans cannot rebind the port after unload
+        self._closed = False
+        self._local_ip: Optional[str] = None
+        # Reused for every recvfrom_into; frames are copied out only when wanted
+        self._rxbuf = bytearray(4096)
+        self._rxview = memoryview(self._rxbuf)
         self._poll_task: Optional[asyncio.Task] = None
+        # Copy-on-write: replaced on (un)subscribe, iterated as-is on notify
+        self._listeners: Tuple[Callable[[], None], ...] = ()
+        self._notify_handle: Optional[asyncio.TimerHandle] = None
+        # unique_ids changed since the last push; published as changed_devices
+        self._changed: Set[str] = set()
+        # What the current listener push is about; None means "everything"
+        # (periodic refresh), so entities must not skip it
+        self.changed_devices: Optional[FrozenSet[str]] = None
+        self._recv_errors = 0
+        self._resume_handle: Optional[asyncio.TimerHandle] = None
+        # Set whenever a previously unknown device answers; discover() waits on it
+        self._new_device_event = asyncio.Event()
+        self._bcast_addr = ("255.255.255.255", port)
         self.state = TisState()
+        # (gw_ip, src_sub, src_dev) -> same objects as state.discovered
+        self._by_addr: Dict[Tuple[str, int, int], TisDeviceInfo] = {}
+        # Append-only list of the same objects for the poll loop; a list can
+        # grow while being iterated, so no per-round snapshot is needed
+        self._devices: List[TisDeviceInfo] = []
+
+    def push_affects(self, unique_id: str) -> bool:
+        """True if the current listener push may concern this device."""
+        changed = self.changed_devices
+        return changed is None or unique_id in changed
+
+    def add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback fired after a received packet updated state."""
+        self._listeners += (update_callback,)
+
+        def _remove() -> None:
+            self._listeners = tuple(cb for cb in self._listeners if cb is not update_callback)
+
+        return _remove
+
+    def _notify(self) -> None:
+        """Schedule one listener flush for everything received in the next _NOTIFY_DELAY."""
+        if self._notify_handle is None:
+            self._notify_handle = asyncio.get_running_loop().call_later(_NOTIFY_DELAY, self._flush_notify)
+
+    def _flush_notify(self) -> None:
+        self._notify_handle = None
+        self.changed_devices = frozenset(self._changed)
+        self._changed.clear()
+        for update_callback in self._listeners:
+            update_callback()
 
     async def async_start(self) -> None:
-        if self._sock:
+        if self._sock or self._closed:
             return
 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Create the socket non-blocking where the platform allows (Linux)
+        nonblock = getattr(socket, "SOCK_NONBLOCK", 0)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM | nonblock)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-        sock.setblocking(False)
+        # Room for a whole discovery burst / poll round. The kernel caps these
+        # at net.core.rmem_max / wmem_max, which most installs (HA OS) cannot
+        # change, so a cap is only logged at debug level. Only the receive
+        # side is checked: sends are a few small datagrams.
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKBUF_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKBUF_SIZE)
+        actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if actual < _SOCKBUF_SIZE:
+            _LOGGER.debug(
+                "TIS UDP receive buffer capped at %d bytes (wanted %d) by net.core.rmem_max",
+                actual,
+                _SOCKBUF_SIZE,
+            )
+        if not nonblock:
+            sock.setblocking(False)
 
         # Listen on the UDP port (6000 by default) for device replies
         sock.bind(("", self.port))
 
         self._sock = sock
-        self._task = asyncio.create_task(self._recv_loop())
+        # Warm the source IP cache so the first sends skip the route probe
+        self._get_local_ip_for_gateway()
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
         self._poll_task = asyncio.create_task(self._rcu_poll_loop())
 
     async def async_stop(self) -> None:
-        if self._task:
-            self._task.cancel()
-            self._task = None
+        if self._notify_handle:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+        if self._resume_handle:
+            self._resume_handle.cancel()
+            self._resume_handle = None
+        self._recv_errors = 0
         if self._poll_task:
             self._poll_task.cancel()
             self._poll_task = None
         if self._sock:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
             try:
                 self._sock.close()
             finally:
                 self._sock = None
+                self._local_ip = None
+
+    async def async_close(self) -> None:
+        """Stop for good; unlike async_stop() the socket is not reopened."""
+        self._closed = True
+        await self.async_stop()
 
     async def send_set_channel(
         self,
@@ -156,50 +385,49 @@ class TisUdpClient:
         value: 0-100 (relay için 0/100)
         """
         await self.async_start()
-        assert self._sock is not None
-        loop = asyncio.get_running_loop()
+        if self._sock is None:
+            return
 
-        source_ip = self._get_local_ip_for_gateway()
-        op = 0x0031
-
-        payload = [
-            int(channel) & 0xFF,
-            int(value) & 0xFF,
-            (int(ramp_seconds) >> 8) & 0xFF,
-            int(ramp_seconds) & 0xFF,
-        ]
-
-        dev_type = device.device_type if device.device_type is not None else 0xFFFE
-
-        pkt_list = build_packet(
-            operation_code=[(op >> 8) & 0xFF, op & 0xFF],
-            ip_address=source_ip,
-            device_id=[device.src_sub & 0xFF, device.src_dev & 0xFF],
-            source_device_id=[0x00, 0x00],
-            device_type=[(int(dev_type) >> 8) & 0xFF, int(dev_type) & 0xFF],
-            additional_packets=payload,
+        payload = _SET_CHANNEL.pack(int(channel) & 0xFF, int(value) & 0xFF, int(ramp_seconds) & 0xFFFF)
+        pkt = _request_packet(
+            self._get_local_ip_for_gateway(),
+            device.src_sub,
+            device.src_dev,
+            device.device_type if device.device_type is not None else 0xFFFE,
+            0x0031,
+            payload,
         )
-
-        await loop.sock_sendto(self._sock, bytes(pkt_list), (device.gw_ip, self.port))
+        await self._sendto(pkt, device.addr or (device.gw_ip, self.port))
+        # Read the result back on the next poll tick
+        device.poll_interval = _POLL_MIN
+        device.next_poll = 0.0
 
     async def _send_read_opcode(self, device: TisDeviceInfo, opcode: int) -> None:
         """Send a read/query opcode with empty additional payload."""
         await self.async_start()
-        assert self._sock is not None
-        loop = asyncio.get_running_loop()
-
-        source_ip = self._get_local_ip_for_gateway()
-        dev_type = device.device_type if device.device_type is not None else 0xFFFE
+        if self._sock is None:
+            return
 
-        pkt_list = build_packet(
-            operation_code=[(opcode >> 8) & 0xFF, opcode & 0xFF],
-            ip_address=source_ip,
-            device_id=[device.src_sub & 0xFF, device.src_dev & 0xFF],
-            source_device_id=[0x00, 0x00],
-            device_type=[(int(dev_type) >> 8) & 0xFF, int(dev_type) & 0xFF],
-            additional_packets=[],
+        pkt = _request_packet(
+            self._get_local_ip_for_gateway(),
+            device.src_sub,
+            device.src_dev,
+            device.device_type if device.device_type is not None else 0xFFFE,
+            opcode,
         )
-        await loop.sock_sendto(self._sock, bytes(pkt_list), (device.gw_ip, self.port))
+        await self._sendto(pkt, device.addr or (device.gw_ip, self.port))
+
+    async def _sendto(self, pkt: bytes, addr: Tuple[str, int]) -> None:
+        """Send right away; only wait on the loop if the send buffer is full."""
+        assert self._sock is not None
+        try:
+            self._sock.sendto(pkt, addr)
+        except BlockingIOError:
+            await asyncio.get_running_loop().sock_sendto(self._sock, pkt, addr)
+        except OSError:
+            # Interface or route probably changed; re-detect the source IP next time
+            self._local_ip = None
+            raise
 
     async def _rcu_poll_loop(self) -> None:
         """Periodically query devices for types (0x0005) and states (0x2025).
@@ -208,21 +436,30 @@ class TisUdpClient:
         some firmwares report unknown types. To keep things robust, we poll all
         discovered devices (they can safely ignore unknown opcodes).
         """
-        # Keep it simple & conservative: poll every 10s
+        # Each device has its own interval: _POLL_MIN after a state change,
+        # stretched by _POLL_BACKOFF per quiet poll up to _POLL_MAX
         while True:
             try:
-                await asyncio.sleep(10)
-                # Snapshot devices to avoid mutation issues
-                devices = list(self.state.discovered.values())
-                for dev in devices:
+                await asyncio.sleep(_POLL_MIN)
+                now = time.monotonic()
+                sent = 0
+                for dev in self._devices:
+                    if dev.next_poll > now:
+                        continue
+                    # Sends no longer yield on their own; let replies in now and then
+                    sent += 1
+                    if not sent % 8:
+                        await asyncio.sleep(0)
+
                     # request types once until we have them
-                    if (not dev.channel_types) and (not getattr(dev, "rcu_types_requested", False)):
+                    if not dev.channel_types and not dev.rcu_types_requested:
                         await self._send_read_opcode(dev, 0x0005)
                         dev.rcu_types_requested = True
-                        await asyncio.sleep(0)  # yield
 
                     # request states always (RCU will answer, others will ignore)
                     await self._send_read_opcode(dev, 0x2025)
+                    dev.next_poll = now + dev.poll_interval
+                    dev.poll_interval = min(dev.poll_interval * _POLL_BACKOFF, _POLL_MAX)
             except asyncio.CancelledError:
                 return
             except Exception:
@@ -230,12 +467,16 @@ class TisUdpClient:
                 continue
 
     def _get_local_ip_for_gateway(self) -> str:
-        """Best-effort local IP detection for the LAN."""
+        """Best-effort local IP detection for the LAN (cached once found)."""
+        if self._local_ip is not None:
+            return self._local_ip
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         try:
             s.connect((self.host, self.port))
-            return s.getsockname()[0]
+            self._local_ip = s.getsockname()[0]
+            return self._local_ip
         except Exception:
+            # Not cached, so the next call retries once the route exists
             return "192.168.1.100"
         finally:
             s.close()
@@ -243,100 +484,159 @@ class TisUdpClient:
     async def discover(self, timeout: float = DEFAULT_SCAN_TIMEOUT) -> Dict[str, TisDeviceInfo]:
         """Broadcast discovery (0x000E) and collect responses (0x000F)."""
         await self.async_start()
-        assert self._sock is not None
-        loop = asyncio.get_running_loop()
-
-        source_ip = self._get_local_ip_for_gateway()
+        if self._sock is None:
+            # Closed
+            return dict(self.state.discovered)
 
-        pkt_list = build_packet(
-            operation_code=[(DISCOVERY_OPCODE >> 8) & 0xFF, DISCOVERY_OPCODE & 0xFF],
-            ip_address=source_ip,
-            device_id=[0xFF, 0xFF],
-            source_device_id=[0x00, 0x00],
-            additional_packets=[],
-        )
-        pkt = bytes(pkt_list)
+        new_device = self._new_device_event
+        new_device.clear()
 
-        # Send to broadcast
-        await loop.sock_sendto(self._sock, pkt, ("255.255.255.255", self.port))
+        # Broadcast to FF.FF with the default 0xFFFE type; memoized like any request
+        pkt = _request_packet(self._get_local_ip_for_gateway(), 0xFF, 0xFF, 0xFFFE, DISCOVERY_OPCODE)
+        await self._sendto(pkt, self._bcast_addr)
 
-        # Wait for responses to populate state.discovered via recv_loop
-        end = time.time() + float(timeout)
-        while time.time() < end:
-            await asyncio.sleep(0.05)
+        # Responses populate state.discovered via _on_readable. Stop once no new
+        # device has shown up for _DISCOVERY_QUIET seconds, bounded by timeout.
+        end = time.monotonic() + float(timeout)
+        while (remaining := end - time.monotonic()) > 0:
+            try:
+                await asyncio.wait_for(new_device.wait(), min(_DISCOVERY_QUIET, remaining))
+            except asyncio.TimeoutError:
+                break
+            new_device.clear()
 
         return dict(self.state.discovered)
 
-    async def _recv_loop(self) -> None:
-        assert self._sock is not None
-        loop = asyncio.get_running_loop()
+    def _on_readable(self) -> None:
+        """Selector callback: drain queued datagrams, then notify once.
 
-        while True:
+        Discovery replies arrive in bursts, so up to _RX_BATCH datagrams are
+        handled per wakeup before yielding back to the loop.
+        """
+        sock = self._sock
+        if sock is None:
+            return
+        buf = self._rxbuf
+        view = self._rxview
+        # One clock read per wakeup; the whole batch arrived "now"
+        now = time.monotonic()
+        received = updated = False
+        for _ in range(_RX_BATCH):
             try:
-                data, addr = await loop.sock_recvfrom(self._sock, 4096)
-            except asyncio.CancelledError:
-                return
-            except Exception:
-                await asyncio.sleep(0.1)
+                n, addr = sock.recvfrom_into(buf)
+            except BlockingIOError:
+                break
+            except OSError as err:
+                self._on_recv_error(err)
+                break
+            received = True
+            if self._recv_errors:
+                _LOGGER.info("TIS UDP receive recovered")
+                self._recv_errors = 0
+            # Cheap header/opcode gate on the shared buffer; only frames we act
+            # on are parsed and CRC-checked. This also drops the echo of our
+            # own 0x000E.
+            if n < MIN_PACKET_LEN or not buf.startswith(SMARTCLOUD_MAGIC, SMARTCLOUD_MAGIC_OFFSET):
+                continue
+            _length, src_sub, src_dev, dev_type, op_code = HEADER.unpack_from(buf, HEADER_OFFSET)
+            if op_code not in _INTERESTING_OPCODES:
                 continue
+            updated |= self._handle_packet(view[:n], addr, now, op_code, src_sub, src_dev, dev_type)
 
-            self.state.last_rx_ts = time.time()
+        if received:
+            self.state.last_rx_ts = now
+        if updated:
+            self._notify()
 
-            parsed = parse_smartcloud_packet(data)
-            if not parsed.get("valid"):
-                continue
-            if not parsed.get("crc_valid", True):
-                continue
+    def _on_recv_error(self, err: OSError) -> None:
+        """Stop reading for a growing delay; rebind after repeated failures."""
+        self._recv_errors += 1
+        if self._recv_errors == 1:
+            _LOGGER.warning("TIS UDP receive failed: %s", err)
+        else:
+            _LOGGER.debug("TIS UDP receive failed again (%d): %s", self._recv_errors, err)
 
-            gw_ip = addr[0]
-            op_code = parsed.get("op_code")
-            src = parsed.get("source_device") or [None, None]
-            src_sub, src_dev = src[0], src[1]
-            dev_type = parsed.get("device_type")
+        loop = asyncio.get_running_loop()
+        loop.remove_reader(self._sock.fileno())
+        if self._recv_errors >= _RX_MAX_ERRORS:
+            _LOGGER.warning("TIS UDP socket kept failing, rebinding")
+            self._recv_errors = 0
+            self.hass.async_create_task(self._async_rebind())
+            return
+        delay = min(0.1 * 2**self._recv_errors, _RX_BACKOFF_MAX)
+        self._resume_handle = loop.call_later(delay, self._resume_reading)
 
-            if src_sub is None or src_dev is None:
-                continue
+    def _resume_reading(self) -> None:
+        self._resume_handle = None
+        if self._sock is not None:
+            asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
 
-            unique_id = f"{gw_ip}-{int(src_sub)}-{int(src_dev)}"
-
-            info = self.state.discovered.get(unique_id)
-            if info is None:
-                info = TisDeviceInfo(
-                    unique_id=unique_id,
-                    gw_ip=gw_ip,
-                    src_sub=int(src_sub),
-                    src_dev=int(src_dev),
-                )
-
-            info.last_seen = time.time()
-            info.raw = parsed
-            if isinstance(dev_type, int):
-                info.device_type = dev_type
-            if isinstance(op_code, int):
-                info.opcodes_seen.add(op_code)
-
-            # 0x000F -> name in additional_data
-            if op_code == DISCOVERY_RESPONSE_OPCODE:
-                name = _extract_cstr(parsed.get("additional_data", b""))
-                if name:
-                    info.name = name
-
-            # 0x0005 -> RCU channel types
-            if op_code == 0x0005:
-                qty, types = _parse_0005(parsed.get("additional_data", b""))
-                if qty:
-                    info.channel_count = qty
-                if types:
-                    info.channel_types = types
-
-            # 0x2025 -> RCU channel states
-            if op_code == 0x2025:
-                states = _parse_2025(parsed.get("additional_data", b""))
-                if states:
-                    info.channel_states = states
+    async def _async_rebind(self) -> None:
+        await self.async_stop()
+        await self.async_start()
 
+    def _handle_packet(
+        self,
+        data: memoryview,
+        addr,
+        now: float,
+        op_code: int,
+        src_sub: int,
+        src_dev: int,
+        dev_type: int,
+    ) -> bool:
+        """Apply one datagram to state. Returns True if anything entities show changed.
+
+        last_seen alone does not count; ages are refreshed by the periodic
+        discovery update.
+
+        ``now`` is a time.monotonic() timestamp shared by the receive batch.
+        The header fields were already unpacked by _on_readable; the full
+        parse is only needed for the CRC check and the payload.
+
+        ``data`` is a view into the reused receive buffer; handlers copy
+        whatever they keep.
+        """
+        parsed = parse_smartcloud_packet(data)
+        if not parsed.valid or not parsed.crc_valid:
+            return False
+
+        # Known devices are found by (gw_ip, sub, dev) without formatting the
+        # string unique_id; that is only built for a new device
+        key = (addr[0], src_sub, src_dev)
+        info = self._by_addr.get(key)
+        is_new = info is None
+        if info is None:
+            gw_ip = addr[0]
+            # Interned once; entity unique_id prefixes reuse the same key object
+            unique_id = sys.intern(f"{gw_ip}-{src_sub}-{src_dev}")
+            info = TisDeviceInfo(
+                unique_id=unique_id,
+                gw_ip=gw_ip,
+                src_sub=src_sub,
+                src_dev=src_dev,
+                addr=(gw_ip, self.port),
+            )
             self.state.discovered[unique_id] = info
-            dispatcher_send(self.hass, SIGNAL_TIS_UPDATE, unique_id)
+            self._by_addr[key] = info
+            self._devices.append(info)
+            self._new_device_event.set()
+
+        info.last_seen = now
+        layout_version = info.layout_version
+        if dev_type != info.device_type:
+            info.device_type = dev_type
+            info.layout_version += 1
+        if op_code not in info.opcodes_seen:
+            info.opcodes_seen.add(op_code)
+            info.layout_version += 1
+
+        handler = _OP_HANDLERS.get(op_code)
+        changed = handler is not None and handler(info, parsed.additional_data)
+        if changed or is_new or info.layout_version != layout_version:
+            self._changed.add(info.unique_id)
+            return True
+        return False
 
 
 class TisCoordinator(DataUpdateCoordinator[TisState]):
@@ -345,15 +645,107 @@ class TisCoordinator(DataUpdateCoordinator[TisState]):
             hass=hass,
             logger=_LOGGER,
             name=f"{DOMAIN}_coordinator",
-            update_interval=None,
+            update_interval=timedelta(seconds=DEFAULT_DISCOVERY_INTERVAL),
         )
         self.client = client
         self.data = client.state
+        self.initial_discovery: Optional[asyncio.Task] = None
+        self._discover_task: Optional[asyncio.Task] = None
+        self._unsub_client: Optional[Callable[[], None]] = None
 
     async def async_start(self) -> None:
         await self.client.async_start()
+        if self._unsub_client is None:
+            # One listener on the client; entities and platforms subscribe to us
+            self._unsub_client = self.client.add_listener(self.async_update_listeners)
+
+    async def async_stop(self) -> None:
+        # No scheduled refresh may start a new scan from here on
+        await self.async_shutdown()
+        if self._unsub_client is not None:
+            self._unsub_client()
+            self._unsub_client = None
+        # The shared scan outlives a cancelled caller (see the shield below);
+        # stop it first so it cannot reopen the socket after we close it
+        task = self._discover_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._discover_task = None
+        await self.client.async_close()
 
     async def async_discover(self) -> Dict[str, TisDeviceInfo]:
-        await self.client.discover()
-        self.async_set_updated_data(self.client.state)
+        """Run a discovery scan now and push the result to listeners."""
+        await self.async_refresh()
         return dict(self.client.state.discovered)
+
+    async def _async_update_data(self) -> TisState:
+        """Periodic rediscovery, shared by every entity instead of per-entity polls."""
+        if self._discover_task is None or self._discover_task.done():
+            self._discover_task = self.hass.async_create_task(self.client.discover())
+        # Shielded so a cancelled caller does not abort the shared scan
+        await asyncio.shield(self._discover_task)
+        # The refresh push covers every device (ages, online state)
+        self.client.changed_devices = None
+        return self.client.state
+
+
+def async_add_device_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: TisCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    build: Callable[[TisDeviceInfo], List[Entity]],
+) -> None:
+    """Add a platform's entities for known devices now and for later ones in batches.
+
+    ``build`` returns the entities not yet created for one device; it is
+    only called again once the device's layout_version changed. Devices
+    found by coordinator updates are collected and added in one batch, so a
+    discovery burst does not call async_add_entities per device.
+    """
+    # unique_id -> layout_version we last built for
+    built: Dict[str, int] = {}
+
+    def _build_changed() -> List[Entity]:
+        ents: List[Entity] = []
+        for dev in coordinator.client.state.discovered.values():
+            if built.get(dev.unique_id) != dev.layout_version:
+                built[dev.unique_id] = dev.layout_version
+                ents.extend(build(dev))
+        return ents
+
+    initial = _build_changed()
+    if initial:
+        async_add_entities(initial)
+
+    pending: List[Entity] = []
+    flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @callback
+    def _flush() -> None:
+        nonlocal flush_handle
+        flush_handle = None
+        if pending:
+            batch = pending[:]
+            pending.clear()
+            async_add_entities(batch)
+
+    @callback
+    def _cancel_flush() -> None:
+        if flush_handle is not None:
+            flush_handle.cancel()
+
+    entry.async_on_unload(_cancel_flush)
+
+    @callback
+    def _on_update_all() -> None:
+        nonlocal flush_handle
+        pending.extend(_build_changed())
+        if pending and flush_handle is None:
+            flush_handle = hass.loop.call_later(_ADD_ENTITIES_DELAY, _flush)
+
+    entry.async_on_unload(coordinator.async_add_listener(_on_update_all))
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
 import time
-from typing import Dict, Set
+from typing import Dict, FrozenSet, Set
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, DEVICE_TYPES
-from .coordinator import TisDeviceInfo
+from .coordinator import TisCoordinator, TisDeviceInfo
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
-    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: TisCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     added: Set[str] = set()
 
@@ -30,7 +32,7 @@ async def async_setup_entry(
         entities.append(TisDiscoveredDeviceSensor(coordinator, entry.entry_id, dev))
         added.add(dev_id)
 
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
     # sonradan keşfedilen cihazları dinleyip ekle
     @callback
@@ -42,20 +44,30 @@ async def async_setup_entry(
             new_entities.append(TisDiscoveredDeviceSensor(coordinator, entry.entry_id, dev))
             added.add(dev_id)
         if new_entities:
-            async_add_entities(new_entities, True)
+            async_add_entities(new_entities)
 
-    coordinator.async_add_listener(_maybe_add_new_devices)
+    entry.async_on_unload(coordinator.async_add_listener(_maybe_add_new_devices))
 
 
-class _BaseTisSensor(SensorEntity):
+class _BaseTisSensor(CoordinatorEntity[TisCoordinator], SensorEntity):
+    """Coordinator tarafından push edilir; periyodik discovery coordinator'da.
+
+    Manuel refresh (UI'dan güncelle) CoordinatorEntity.async_update üzerinden
+    yine discovery'yi tetikler.
+    """
+
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator):
-        self.coordinator = coordinator
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.client.changed_devices
+        if changed is not None and not self._affected_by(changed):
+            return
+        super()._handle_coordinator_update()
 
-    async def async_update(self):
-        # Manuel refresh (UI'dan güncelle) discovery'yi tekrar koşturur
-        await self.coordinator.async_discover()
+    def _affected_by(self, changed: FrozenSet[str]) -> bool:
+        """Debug sensörler sadece periyodik refresh ile güncellenir."""
+        return False
 
 
 class TisDiscoveredCountSensor(_BaseTisSensor):
@@ -77,7 +89,7 @@ class TisSecondsSinceLastPacketSensor(_BaseTisSensor):
         ts = self.coordinator.data.last_rx_ts
         if ts is None:
             return None
-        return round(time.time() - ts, 1)
+        return round(time.monotonic() - ts, 1)
 
 
 class TisDiscoveredDeviceSensor(_BaseTisSensor):
@@ -100,6 +112,9 @@ class TisDiscoveredDeviceSensor(_BaseTisSensor):
         nice_name = dev.name.strip() if dev.name else dev.src_str
         self._attr_name = f"{nice_name}"
 
+    def _affected_by(self, changed: FrozenSet[str]) -> bool:
+        return self._dev_id in changed
+
     @property
     def _dev(self) -> TisDeviceInfo | None:
         return (self.coordinator.data.discovered or {}).get(self._dev_id)
@@ -110,7 +125,7 @@ class TisDiscoveredDeviceSensor(_BaseTisSensor):
         if not dev:
             return "unknown"
         # 30 sn içinde görüldüyse online
-        age = time.time() - float(dev.last_seen or 0.0)
+        age = time.monotonic() - float(dev.last_seen or 0.0)
         return "online" if age <= 30 else "offline"
 
     @property
@@ -126,7 +141,9 @@ class TisDiscoveredDeviceSensor(_BaseTisSensor):
             "device_type": dev.device_type,
             "device_type_hex": dev.device_type_hex,
             "device_model": model,
-            "last_seen_age_s": round(time.time() - float(dev.last_seen or 0.0), 1),
+            # Saniyeye yuvarlanmış sabit zaman; her yazımda değişen bir yaş
+            # değeri her seferinde yeni bir recorder kaydı demekti
+            "last_seen": dt_util.utc_from_timestamp(round(time.time() - time.monotonic() + dev.last_seen)),
             "opcodes_seen": sorted(list(dev.opcodes_seen)),
         }
 
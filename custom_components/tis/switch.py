@@ -1,58 +1,23 @@
 from __future__ import annotations
 
+import sys
 from typing import Any, Dict, List
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DEVICE_TYPES, DOMAIN, SIGNAL_TIS_UPDATE
-from .coordinator import TisCoordinator, TisDeviceInfo
-
-
-def _is_rcu(device: TisDeviceInfo) -> bool:
-    """Best-effort detection of an RCU device.
-
-    Not all firmwares report a device_type that maps to DEVICE_TYPES.
-    In that case we fall back to observed opcodes / payload characteristics.
-    """
-    dt = device.device_type
-    if dt is not None:
-        model = DEVICE_TYPES.get(dt, "")
-        if model.startswith("RCU"):
-            return True
-
-    name = (device.name or "").upper()
-    if "RCU" in name:
-        return True
-
-    # Heuristic: RCU devices tend to emit these opcodes (states/types)
-    seen = set(getattr(device, "opcodes_seen", []) or [])
-    if {0x2025, 0x0005, 0x0034, 0x0033, 0x0031, 0x0032}.intersection(seen):
-        return True
-
-    # Another heuristic: if we have a long channel state vector, it's very likely an RCU
-    states = getattr(device, "channel_states", [])
-    if isinstance(states, list) and len(states) >= 20:
-        return True
-
-    return False
-
-
-def _rcu_layout(dev: TisDeviceInfo) -> tuple[int, int]:
-    """Return (outputs, inputs) for known RCU models."""
-    model = DEVICE_TYPES.get(dev.device_type or 0, "")
-    if model.startswith("RCU24"):
-        return (24, 20)
-
-    # If we already saw a long state vector, assume the common 24/20 layout.
-    states = getattr(dev, "channel_states", [])
-    if isinstance(states, list) and len(states) >= 44:
-        return (24, 20)
-
-    return (0, 0)
+from .const import DEVICE_TYPES, DOMAIN
+from .coordinator import (
+    TisCoordinator,
+    TisDeviceInfo,
+    async_add_device_entities,
+    is_rcu_device,
+    rcu_layout,
+)
 
 
 async def async_setup_entry(
@@ -62,7 +27,8 @@ async def async_setup_entry(
 ) -> None:
     coordinator: TisCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    created: set[str] = set()
+    # unique_id -> bitmask of channels that already have a switch
+    created: Dict[str, int] = {}
 
     def build_for_device(dev: TisDeviceInfo) -> List[SwitchEntity]:
         """Build controllable RCU output switches.
@@ -70,89 +36,90 @@ async def async_setup_entry(
         Preferred: use channel_types (0x0005).
         Fallback: for known models (RCU24...), create a fixed set (24 OUT).
         """
-        if not _is_rcu(dev):
+        if not is_rcu_device(dev):
             return []
 
-        entities: List[SwitchEntity] = []
+        uid = dev.unique_id
+        prefix = sys.intern(f"{uid}-rcu-out-")
+        mask = created.get(uid, 0)
 
         # Preferred path: types known
-        if getattr(dev, "channel_types", None):
-            for ch, ch_type in enumerate(dev.channel_types, start=1):
-                # Tester mapping: 0x01 = Output, 0x02 = Input
-                if ch_type == 0x01:
-                    ent = TisRcuOutputSwitch(coordinator, dev.unique_id, ch)
-                    if ent.unique_id not in created:
-                        created.add(ent.unique_id)
-                        entities.append(ent)
-            return entities
-
-        # Fallback for known models
-        outs, _ins = _rcu_layout(dev)
-        if outs:
-            for ch in range(1, outs + 1):
-                ent = TisRcuOutputSwitch(coordinator, dev.unique_id, ch)
-                if ent.unique_id not in created:
-                    created.add(ent.unique_id)
-                    entities.append(ent)
-        return entities
-
-    # initial add
-    initial: List[SwitchEntity] = []
-    for dev in coordinator.client.state.discovered.values():
-        initial.extend(build_for_device(dev))
-    if initial:
-        async_add_entities(initial)
-
-    def _on_update(unique_id: str) -> None:
-        dev = coordinator.client.state.discovered.get(unique_id)
-        if not dev:
-            return
-        new_entities = build_for_device(dev)
-        if new_entities:
-            async_add_entities(new_entities)
+        if dev.channel_types:
+            # Tester mapping: 0x01 = Output, 0x02 = Input
+            chans = [ch for ch, ch_type in enumerate(dev.channel_types, start=1) if ch_type == 0x01 and not mask >> ch & 1]
+        else:
+            # Fallback for known models
+            outs, _ins = rcu_layout(dev)
+            chans = [ch for ch in range(1, outs + 1) if not mask >> ch & 1]
 
-    async_dispatcher_connect(hass, SIGNAL_TIS_UPDATE, _on_update)
+        for ch in chans:
+            mask |= 1 << ch
+        created[uid] = mask
+        return [TisRcuOutputSwitch(coordinator, uid, prefix, ch) for ch in chans]
 
+    async_add_device_entities(hass, entry, coordinator, async_add_entities, build_for_device)
 
-class TisRcuOutputSwitch(SwitchEntity):
+
+class TisRcuOutputSwitch(CoordinatorEntity[TisCoordinator], SwitchEntity):
     _attr_icon = "mdi:toggle-switch"
 
-    def __init__(self, coordinator: TisCoordinator, device_unique_id: str, channel: int) -> None:
-        self._coordinator = coordinator
+    def __init__(self, coordinator: TisCoordinator, device_unique_id: str, unique_id_prefix: str, channel: int) -> None:
+        super().__init__(coordinator)
         self._device_unique_id = device_unique_id
         self._channel = channel
 
-        self._attr_unique_id = f"{device_unique_id}-rcu-out-{channel}"
-        self._attr_name = f"TIS RCU OUT {channel}"
+        self._attr_unique_id = unique_id_prefix + str(channel)
+        # Names repeat for every RCU; share one string object per channel
+        self._attr_name = sys.intern(f"TIS RCU OUT {channel}")
+        self._attr_is_on = self._read_is_on()
 
-    def _device(self) -> TisDeviceInfo | None:
-        return self._coordinator.client.state.discovered.get(self._device_unique_id)
+        # Device registry info is only read when the entity is added
+        dev = self._device()
+        if not dev:
+            self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, device_unique_id)})
+        else:
+            dt = dev.device_type or 0
+            self._attr_device_info = DeviceInfo(
+                identifiers={(DOMAIN, device_unique_id)},
+                name=dev.name or f"TIS {device_unique_id}",
+                manufacturer="TIS",
+                model=DEVICE_TYPES.get(dt, f"0x{dt:04X}"),
+            )
 
-    @property
-    def available(self) -> bool:
-        return self._device() is not None
+    def _device(self) -> TisDeviceInfo | None:
+        return self.coordinator.client.state.discovered.get(self._device_unique_id)
 
-    @property
-    def is_on(self) -> bool | None:
+    def _read_is_on(self) -> bool | None:
         dev = self._device()
         if not dev:
             return None
-        states = getattr(dev, "channel_states", [])
+        states = dev.channel_states
         if len(states) >= self._channel:
             return bool(states[self._channel - 1])
         return None
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.client.push_affects(self._device_unique_id):
+            return
+        self._attr_is_on = self._read_is_on()
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        return self._device() is not None
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         dev = self._device()
         if not dev:
             return
-        await self._coordinator.client.send_set_channel(dev, self._channel, 100, ramp_seconds=0)
+        await self.coordinator.client.send_set_channel(dev, self._channel, 100, ramp_seconds=0)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         dev = self._device()
         if not dev:
             return
-        await self._coordinator.client.send_set_channel(dev, self._channel, 0, ramp_seconds=0)
+        await self.coordinator.client.send_set_channel(dev, self._channel, 0, ramp_seconds=0)
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
@@ -169,18 +136,3 @@ class TisRcuOutputSwitch(SwitchEntity):
                 }
             )
         return attrs
-
-    @property
-    def device_info(self) -> Dict[str, Any]:
-        dev = self._device()
-        if not dev:
-            return {"identifiers": {(DOMAIN, self._device_unique_id)}}
-
-        dt = dev.device_type or 0
-        model = DEVICE_TYPES.get(dt, f"0x{dt:04X}")
-        return {
-            "identifiers": {(DOMAIN, self._device_unique_id)},
-            "name": dev.name or f"TIS {self._device_unique_id}",
-            "manufacturer": "TIS",
-            "model": model,
-        }